@@ -1174,6 +1174,15 @@ class EnhancedSecurityScanner:
         return report
 
 
+def scan(skill_path, verbose: bool = False) -> Dict:
+    """Scan a skill directory and return the report dict.
+
+    Importable entry point so callers (e.g. tests) can scan in-process
+    without paying interpreter startup for every invocation.
+    """
+    return EnhancedSecurityScanner(skill_path, verbose=verbose).scan()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Enhanced security scanner for Claude Code skills v2.0"
@@ -1196,8 +1205,7 @@ def main():
 
     for skill_path in skill_paths:
         try:
-            scanner = EnhancedSecurityScanner(skill_path, verbose=args.verbose)
-            report = scanner.scan()
+            report = scan(skill_path, verbose=args.verbose)
             all_reports.append(report)
 
             print(f"\n{'=' * 60}", file=sys.stderr)
@@ -2,18 +2,67 @@
 Pytest fixtures for security scanner tests.
 """
 
+import hashlib
+import sys
 from pathlib import Path
 
 import pytest
 
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
 
-@pytest.fixture
+
+@pytest.fixture(scope="session", autouse=True)
+def _scanner_importable():
+    """Make the scanner module importable for in-process scanning."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    yield
+    sys.path.remove(str(SCRIPTS_DIR))
+
+
+@pytest.fixture(scope="session")
+def scan_cache() -> dict:
+    """Session-wide memo of scan reports keyed by skill-dir content hash."""
+    return {}
+
+
+@pytest.fixture(scope="session")
+def cached_scan(scan_cache: dict, _scanner_importable):
+    """Return a scan function memoized on the skill directory's contents.
+
+    Identical input produces an identical report, so re-scanning the same
+    sample (e.g. 01_indirect_execution.py is used by two tests) returns
+    the cached dict instead of running the scanner again.
+
+    Scans deliberately run in this process rather than in a warm worker
+    pool: the scanner is pure regex/YAML analysis (it never executes the
+    samples), so subprocess isolation buys nothing here, and a direct call
+    amortizes interpreter and import cost to zero without any IPC
+    round-trip per scan. Only the CLI tests keep a subprocess boundary.
+    """
+
+    def _scan(skill_dir: Path) -> dict:
+        digest = hashlib.sha256()
+        for path in sorted(p for p in skill_dir.rglob("*") if p.is_file()):
+            digest.update(str(path.relative_to(skill_dir)).encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+        key = digest.digest()
+        if key not in scan_cache:
+            from security_scanner import scan
+
+            scan_cache[key] = scan(skill_dir)
+        return scan_cache[key]
+
+    return _scan
+
+
+@pytest.fixture(scope="session")
 def fixtures_dir() -> Path:
     """Return the path to the fixtures directory."""
     return Path(__file__).parent / "fixtures"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def malicious_samples_dir(fixtures_dir: Path) -> Path:
     """Return the path to the malicious samples directory."""
     return fixtures_dir / "malicious_samples"
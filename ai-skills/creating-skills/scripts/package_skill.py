@@ -11,8 +11,13 @@ Example:
 """
 
 import fnmatch
+import hashlib
+import os
+import re
 import sys
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from quick_validate import validate_skill
 
@@ -55,23 +60,111 @@ EXCLUDE_PATTERNS = [
     '.venv',
 ]
 
+# Formats that are already compressed; re-deflating them burns CPU for
+# essentially zero size reduction, so they are stored as-is
+_STORED_EXTS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp4', '.mp3', '.pdf',
+    '.zip', '.gz', '.xz', '.bz2', '.woff', '.woff2',
+}
 
-def should_include(file_path, skill_path):
-    """Check if file should be included based on whitelist and exclusions."""
-    rel = file_path.relative_to(skill_path)
-    parts = rel.parts
-
-    # Check top-level item against whitelist
-    top_level = parts[0]
-    if top_level not in ALLOWED_TOP_LEVEL:
-        return False
-
-    # Check all path components against exclusion patterns
-    for part in parts:
-        for pattern in EXCLUDE_PATTERNS:
-            if fnmatch.fnmatch(part, pattern):
-                return False
-    return True
+# Most exclusion patterns are literal names, which an O(1) set lookup
+# handles; only the handful of actual globs need the compiled regex,
+# pre-translated once so each check is a single match
+_LITERAL_EXCLUDES = frozenset(
+    p for p in EXCLUDE_PATTERNS if not any(c in p for c in '*?[')
+)
+_GLOB_EXCLUDES_RE = re.compile(
+    "|".join(
+        f"(?:{fnmatch.translate(p)})"
+        for p in EXCLUDE_PATTERNS if p not in _LITERAL_EXCLUDES
+    )
+)
+
+
+def _is_excluded(name):
+    """Check a single path component against the exclusion patterns."""
+    return name in _LITERAL_EXCLUDES or _GLOB_EXCLUDES_RE.match(name) is not None
+
+
+def _collect_skill_files(skill_path):
+    """Recursively collect files to package, pruning excluded directories.
+
+    Excluded directories (e.g. __pycache__, .git, venv) are skipped without
+    descending, so their contents are never stat'd or matched. Works on
+    plain strings throughout -- per-file Path objects and relative_to calls
+    are measurable overhead on large trees. Returns (files, skipped) where
+    files is a list of (absolute path, archive name) tuples and skipped
+    counts the entries rejected at the directory level.
+    """
+    files = []
+    skipped = 0
+    # Archive names are relative to the skill's parent, so slicing off this
+    # prefix replaces a relative_to computation per file
+    prefix_len = len(str(skill_path.parent)) + 1
+
+    def _walk(dir_path, top_level=False):
+        nonlocal skipped
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if (top_level and entry.name not in ALLOWED_TOP_LEVEL) or \
+                        _is_excluded(entry.name):
+                    skipped += 1
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    _walk(entry.path)
+                elif entry.is_file():
+                    files.append((entry.path, entry.path[prefix_len:]))
+
+    _walk(str(skill_path), top_level=True)
+    return files, skipped
+
+
+def _load_and_compress(file_path):
+    """Read a file and deflate it unless its format is already compressed.
+
+    Returns (data, compressed) where compressed is None for stored
+    formats. zlib releases the GIL, so running this in a thread pool
+    scales the compression step across cores.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if os.path.splitext(file_path)[1].lower() in _STORED_EXTS:
+        return data, None
+    # Raw deflate stream (wbits=-15), as the zip format requires
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return data, compressor.compress(data) + compressor.flush()
+
+
+def _write_precompressed(zipf, file_path, arcname, data, compressed):
+    """Append an already-deflated member to an open ZipFile.
+
+    zipfile has no public API for handing it pre-compressed bytes (write()
+    and writestr() both re-deflate), so fill in the ZipInfo ourselves and
+    write the local header and payload directly. ZipFile.close() emits the
+    central directory from filelist as usual.
+    """
+    info = zipfile.ZipInfo.from_file(file_path, arcname)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.CRC = zlib.crc32(data)
+    info.file_size = len(data)
+    info.compress_size = len(compressed)
+    with zipf._lock:
+        zipf._writecheck(info)
+        zipf._didModify = True
+        zipf.fp.seek(zipf.start_dir)
+        info.header_offset = zipf.fp.tell()
+        zipf.fp.write(info.FileHeader(zip64=False))
+        zipf.fp.write(compressed)
+        zipf.start_dir = zipf.fp.tell()
+        zipf.filelist.append(info)
+        zipf.NameToInfo[info.filename] = info
+
+
+def _write_stored(zipf, file_path, arcname, data):
+    """Add an already-compressed format to the archive without deflating."""
+    info = zipfile.ZipInfo.from_file(file_path, arcname)
+    info.compress_type = zipfile.ZIP_STORED
+    zipf.writestr(info, data)
 
 
 def package_skill(skill_path, output_dir=None):
@@ -123,37 +216,53 @@ def package_skill(skill_path, output_dir=None):
 
     # Create the .skill file (zip format)
     try:
+        # One walk collects everything, including the top-level SKILL.md and
+        # LICENSE.txt, so they aren't stat'd and re-checked separately.
+        # Emit in deterministic order (SKILL.md first, then LICENSE.txt,
+        # then the rest sorted) so the content hash below is stable across
+        # runs. Note the archives themselves are not byte-identical on
+        # rebuild: zip entries embed file mtimes
+        files, skipped = _collect_skill_files(skill_path)
+        special = {
+            os.path.join(skill_name, 'SKILL.md'): 0,
+            os.path.join(skill_name, 'LICENSE.txt'): 1,
+        }
+        files.sort(key=lambda f: (special.get(f[1], 2), f[1]))
+
+        # Hash the ordered file list; if it matches the hash stashed in an
+        # existing archive's comment, nothing changed and the rebuild
+        # (compression and all) can be skipped entirely
+        digest = hashlib.sha256()
+        for file_path, arcname in files:
+            digest.update(arcname.encode())
+            digest.update(b'\0')
+            with open(file_path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        content_hash = digest.hexdigest().encode()
+
+        if skill_filename.exists():
+            try:
+                with zipfile.ZipFile(skill_filename) as existing:
+                    if existing.comment == content_hash:
+                        print(f"✅ Skill unchanged, keeping existing: {skill_filename}")
+                        return skill_filename
+            except zipfile.BadZipFile:
+                pass
+
+        # Compress file contents in parallel, then write in order
+        with ThreadPoolExecutor() as pool:
+            payloads = list(pool.map(_load_and_compress, [f[0] for f in files]))
+
         with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Always include SKILL.md first (it's at root level)
-            skill_md = skill_path / 'SKILL.md'
-            arcname = skill_md.relative_to(skill_path.parent)
-            zipf.write(skill_md, arcname)
-            print(f"  Added: {arcname}")
-
-            # Include LICENSE.txt if it exists
-            license_file = skill_path / 'LICENSE.txt'
-            if license_file.exists():
-                arcname = license_file.relative_to(skill_path.parent)
-                zipf.write(license_file, arcname)
+            zipf.comment = content_hash
+            for (file_path, arcname), (data, compressed) in zip(files, payloads):
+                if compressed is None:
+                    _write_stored(zipf, file_path, arcname, data)
+                else:
+                    _write_precompressed(zipf, file_path, arcname, data, compressed)
                 print(f"  Added: {arcname}")
-
-            # Walk through the skill directory for other files
-            included = 0
-            skipped = 0
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Skip files already added
-                    if file_path.name in ('SKILL.md', 'LICENSE.txt') and file_path.parent == skill_path:
-                        continue
-                    if should_include(file_path, skill_path):
-                        arcname = file_path.relative_to(skill_path.parent)
-                        zipf.write(file_path, arcname)
-                        print(f"  Added: {arcname}")
-                        included += 1
-                    else:
-                        skipped += 1
             if skipped:
-                print(f"\n  Skipped {skipped} file(s) not in allowed directories or matching exclusions")
+                print(f"\n  Skipped {skipped} entr(ies) not in allowed directories or matching exclusions")
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename
@@ -17,8 +17,10 @@ Usage:
       -- python test.py
 """
 
+import concurrent.futures
 import subprocess
 import socket
+import signal
 import time
 import sys
 import argparse
@@ -26,17 +28,47 @@ import shlex
 import os
 
 def is_server_ready(port, timeout=30):
-    """Wait for server to be ready by polling the port."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    """Wait for server to be ready by polling the port.
+
+    Polls with exponential backoff (10ms up to 250ms) so fast-starting
+    servers are detected almost immediately instead of waiting out a
+    fixed sleep interval.
+    """
+    deadline = time.time() + timeout
+    delay = 0.01
+    while time.time() < deadline:
         try:
-            with socket.create_connection(('localhost', port), timeout=1):
+            # Cap the connect timeout by the time remaining so the last
+            # attempt doesn't overshoot the overall deadline
+            connect_timeout = min(1, max(deadline - time.time(), 0.001))
+            with socket.create_connection(('localhost', port), timeout=connect_timeout):
                 return True
         except (socket.error, ConnectionRefusedError):
-            time.sleep(0.5)
+            time.sleep(min(delay, max(deadline - time.time(), 0)))
+            delay = min(delay * 1.5, 0.25)
     return False
 
 
+def stop_server(process, force=False):
+    """Signal a server process, including any children it spawned.
+
+    On POSIX the server runs in its own session, so signalling the process
+    group also reaps grandchildren (npm scripts commonly wrap the real
+    server). Falls back to terminate/kill on the process itself.
+    """
+    if sys.platform != 'win32':
+        sig = signal.SIGKILL if force else signal.SIGTERM
+        try:
+            os.killpg(os.getpgid(process.pid), sig)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    if force:
+        process.kill()
+    else:
+        process.terminate()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Run command with one or more servers')
     parser.add_argument('--server', action='append', dest='servers', required=True, help='Server command (can be repeated)')
@@ -79,25 +111,37 @@ def main():
     server_processes = []
 
     try:
-        # Start all servers
+        # Launch every server first so they boot concurrently
         for i, server in enumerate(servers):
             cwd_msg = f" (cwd: {server['cwd']})" if server['cwd'] else ""
             print(f"Starting server {i+1}/{len(servers)}: {server['cmd']}{cwd_msg}")
 
+            # Discard server output: nothing reads these streams, and PIPE
+            # buffers eventually fill and block chatty dev servers.
+            # Note: cwd and start_new_session make this call ineligible for
+            # CPython's posix_spawn fast path; the group-kill semantics are
+            # worth that trade, and avoiding preexec_fn keeps vfork available
+            # on Linux so launches still skip the full fork copy there
             process = subprocess.Popen(
                 shlex.split(server['cmd']),
                 cwd=server['cwd'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=(sys.platform != 'win32')
             )
             server_processes.append(process)
 
-            # Wait for this server to be ready
-            print(f"Waiting for server on port {server['port']}...")
-            if not is_server_ready(server['port'], timeout=args.timeout):
-                raise RuntimeError(f"Server failed to start on port {server['port']} within {args.timeout}s")
-
-            print(f"Server ready on port {server['port']}")
+        # Then wait for all ports in parallel instead of one after another
+        print(f"Waiting for {len(servers)} server(s) to be ready...")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(servers)) as pool:
+            futures = {
+                pool.submit(is_server_ready, server['port'], args.timeout): server['port']
+                for server in servers
+            }
+            for future, port in futures.items():
+                if not future.result():
+                    raise RuntimeError(f"Server failed to start on port {port} within {args.timeout}s")
+                print(f"Server ready on port {port}")
 
         print(f"\nAll {len(servers)} server(s) ready")
 
@@ -111,10 +155,10 @@ def main():
         print(f"\nStopping {len(server_processes)} server(s)...")
         for i, process in enumerate(server_processes):
             try:
-                process.terminate()
+                stop_server(process)
                 process.wait(timeout=5)
             except subprocess.TimeoutExpired:
-                process.kill()
+                stop_server(process, force=True)
                 process.wait()
             print(f"Server {i+1} stopped")
         print("All servers stopped")